@@ -1,17 +1,19 @@
 import dataclasses
 import datetime
-import dateutil.parser
 import enum
 import functools
+import hashlib
 import itertools
+import logging
 import os
+import pickle
+import tempfile
 import typing
 
-import dacite
-import yaml
-
 import paths
 
+logger = logging.getLogger(__name__)
+
 own_dir = os.path.abspath(os.path.dirname(__file__))
 repo_root = os.path.abspath(os.path.join(
     own_dir, os.path.pardir, os.path.pardir))
@@ -63,14 +65,39 @@ class FeatureDescriptor:
                           ) -> typing.Generator['FeatureDescriptor', None, None]:
         '''
         returns the tuple of features (transtively) included by this feature
+
+        if transitive, each feature is yielded only once (even if included via multiple paths),
+        ordered by name
         '''
-        included_features = (feature_by_name(name)
-                             for name in self.included_feature_names())
+        if transitive:
+            names = sorted(_transitive_feature_names(self.name))
+        else:
+            names = self.included_feature_names()
+
+        yield from (feature_by_name(name) for name in names)
+
 
-        for included_feature in included_features:
-            if transitive:
-                yield from included_feature.included_features()
-            yield included_feature
+class _FrozenSlots:
+    '''
+    mixin for frozen dataclasses declaring `__slots__` (to avoid a per-instance `__dict__`)
+
+    frozen dataclasses reject attribute assignment, which breaks the default pickle / copy
+    protocol for instances without `__dict__` - this is restored here (as is done by
+    `dataclasses.dataclass(slots=True)`, which requires Python >= 3.10).
+    '''
+    __slots__ = ()
+
+    def __getstate__(self):
+        return {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, '__slots__', ())
+            if hasattr(self, name)
+        }
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
 
 
 class Architecture(enum.Enum):
@@ -81,10 +108,12 @@ class Architecture(enum.Enum):
 
 
 @dataclasses.dataclass(frozen=True)
-class GardenlinuxFlavour:
+class GardenlinuxFlavour(_FrozenSlots):
     '''
     A specific flavour of gardenlinux.
     '''
+    __slots__ = ('architecture', 'platform', 'modifiers', '_modifiers_set')
+
     architecture: Architecture
     platform: str
     modifiers: typing.Tuple[Modifier]
@@ -94,7 +123,7 @@ class GardenlinuxFlavour:
         yield from platform.included_features()
         yield from (
             feature_by_name(f) for f
-            in normalised_modifiers(platform=self.platform, modifiers=self.modifiers)
+            in normalised_modifiers(platform=self.platform, modifiers=self._modifiers_set)
         )
 
     def canonical_name_prefix(self):
@@ -104,27 +133,34 @@ class GardenlinuxFlavour:
         return f'{a}/{fname_prefix}'
 
     def filename_prefix(self):
-        p = self.platform
-        m = '_'.join(sorted([m for m in self.modifiers]))
-
-        return f'{p}-{m}'
+        return _filename_prefix(platform=self.platform, modifiers=tuple(self.modifiers))
 
     def __post_init__(self):
+        # set-representation of modifiers (used as cache-key for normalisation / canonicalisation)
+        object.__setattr__(self, '_modifiers_set', frozenset(self.modifiers))
+
         # validate platform and modifiers
-        platform_names = {platform.name for platform in platforms()}
+        platform_names = _platform_names()
         if not self.platform in platform_names:
             raise ValueError(
-                f'unknown platform: {self.platform}. known: {platform_names}'
+                f'unknown platform: {self.platform}. known: {sorted(platform_names)}'
             )
 
-        modifier_names = {modifier.name for modifier in modifiers()}
-        unknown_mods = set(self.modifiers) - modifier_names
+        modifier_names = _modifier_names()
+        unknown_mods = self._modifiers_set - modifier_names
         if unknown_mods:
             raise ValueError(
-                f'unknown modifiers: {unknown_mods}. known: {modifier_names}'
+                f'unknown modifiers: {sorted(unknown_mods)}. known: {sorted(modifier_names)}'
             )
 
 
+@functools.lru_cache(maxsize=None)
+def _filename_prefix(platform: Platform, modifiers: typing.Tuple[Modifier]) -> str:
+    m = '_'.join(sorted(modifiers))
+
+    return f'{platform}-{m}'
+
+
 @dataclasses.dataclass(frozen=True)
 class GardenlinuxFlavourCombination:
     '''
@@ -150,24 +186,27 @@ class GardenlinuxFlavourSet:
 
     def flavours(self):
         for comb in self.flavour_combinations:
-            for arch, platf, mods in itertools.product(
-                comb.architectures,
+            for platf, mods in itertools.product(
                 comb.platforms,
                 comb.modifiers,
             ):
-                yield GardenlinuxFlavour(
-                    architecture=arch,
-                    platform=platf,
-                    modifiers=normalised_modifiers(
-                        platform=platf, modifiers=mods),
-                )
+                # normalisation does not depend on architecture
+                normalised_mods = normalised_modifiers(platform=platf, modifiers=mods)
+                for arch in comb.architectures:
+                    yield GardenlinuxFlavour(
+                        architecture=arch,
+                        platform=platf,
+                        modifiers=normalised_mods,
+                    )
 
 
 @dataclasses.dataclass(frozen=True)
-class ReleaseFile:
+class ReleaseFile(_FrozenSlots):
     '''
     base class for release-files
     '''
+    __slots__ = ('name', 'suffix')
+
     name: str
     suffix: str
 
@@ -178,16 +217,28 @@ class S3_ReleaseFile(ReleaseFile):
     A single build result file that was (or will be) uploaded to build result persistency store
     (S3).
     '''
+    __slots__ = ('s3_key', 's3_bucket_name')
+
     s3_key: str
     s3_bucket_name: str
 
 
 @dataclasses.dataclass(frozen=True)
-class ReleaseIdentifier:
+class ReleaseIdentifier(_FrozenSlots):
     '''
     a partial ReleaseManifest with all attributes required to unambiguosly identify a
     release.
     '''
+    __slots__ = (
+        'build_committish',
+        'version',
+        'gardenlinux_epoch',
+        'architecture',
+        'platform',
+        'modifiers',
+        '_modifiers_set',
+    )
+
     build_committish: str
     version: str
     gardenlinux_epoch: int
@@ -197,7 +248,7 @@ class ReleaseIdentifier:
 
     def flavour(self, normalise=True) -> GardenlinuxFlavour:
         mods = normalised_modifiers(
-            platform=self.platform, modifiers=self.modifiers)
+            platform=self.platform, modifiers=self._modifiers_set)
 
         return GardenlinuxFlavour(
             architecture=self.architecture,
@@ -221,13 +272,15 @@ class ReleaseIdentifier:
 
         note that the full key should be prefixed (e.g. with manifest_key_prefix)
         '''
-        flavour_name = '-'.join((
-            f.name for f in canonicalised_features(
-                platform=self.platform,
-                modifiers=self.modifiers,
-            )
-        ))
-        return f'{flavour_name}-{self.version}'
+        return _canonical_release_manifest_key_suffix(
+            platform=self.platform,
+            modifiers=self._modifiers_set,
+            version=self.version,
+        )
+
+    def __post_init__(self):
+        # set-representation of modifiers (used as cache-key for normalisation / canonicalisation)
+        object.__setattr__(self, '_modifiers_set', frozenset(self.modifiers))
 
     def canonical_release_manifest_key(self):
         return f'{self.manifest_key_prefix}/{self.canonical_release_manifest_key_suffix()}'
@@ -278,16 +331,26 @@ class ReleaseManifest(ReleaseIdentifier):
     metadata for a gardenlinux release variant that can be (or was) published to a persistency
     store, such as an S3 bucket.
     '''
+    __slots__ = ('build_timestamp', 'paths', 'published_image_metadata', '_paths_by_suffix')
+
     build_timestamp: str
     paths: typing.Tuple[typing.Union[S3_ReleaseFile]]
     published_image_metadata: typing.Union[AlicloudPublishedImageSet,
                                            AwsPublishedImageSet, GcpPublishedImage, None]
 
     def path_by_suffix(self, suffix: str):
-        for path in self.paths:
-            if path.suffix == suffix:
-                return path
-        else:
+        try:
+            paths_by_suffix = self._paths_by_suffix
+        except AttributeError:
+            # lazily index paths (once per manifest)
+            paths_by_suffix = {}
+            for path in self.paths:
+                paths_by_suffix.setdefault(path.suffix, path) # first path wins
+            object.__setattr__(self, '_paths_by_suffix', paths_by_suffix)
+
+        try:
+            return paths_by_suffix[suffix]
+        except KeyError:
             raise ValueError(f'no path with {suffix=}')
 
     def release_identifier(self) -> ReleaseIdentifier:
@@ -301,31 +364,58 @@ class ReleaseManifest(ReleaseIdentifier):
         )
 
 
+def _as_frozenset(modifiers) -> typing.FrozenSet[Modifier]:
+    if isinstance(modifiers, frozenset):
+        return modifiers
+    return frozenset(modifiers)
+
+
 def normalised_modifiers(platform: Platform, modifiers) -> typing.Tuple[str]:
     '''
     determines the transitive closure of all features from the given platform and modifiers,
     and returns the (ASCII-upper-case-sorted) result as a `tuple` of str of all modifiers,
     except for the platform
     '''
-    platform = feature_by_name(platform)
-    modifiers = {feature_by_name(f) for f in modifiers}
+    return _normalised_modifiers(
+        platform=platform,
+        modifiers=_as_frozenset(modifiers),
+    )
+
 
-    all_modifiers = set((m.name for m in modifiers))
+@functools.lru_cache(maxsize=None)
+def _normalised_modifiers(platform: Platform, modifiers: typing.FrozenSet[Modifier]):
+    all_modifiers = set(modifiers)
     for m in modifiers:
-        all_modifiers |= set((m.name for m in m.included_features()))
+        all_modifiers |= _transitive_feature_names(m)
 
-    for f in platform.included_features():
-        all_modifiers.add(f.name)
+    all_modifiers |= _transitive_feature_names(platform)
 
+    # UPPER-cased-sort, so _ is after alpha - must not be changed to e.g. casefold, as this
+    # would change normalised modifiers (and thus canonical names)
     normalised_features = tuple(sorted(all_modifiers, key=str.upper))
 
     return normalised_features
 
 
+@functools.lru_cache(maxsize=None)
+def _canonical_release_manifest_key_suffix(
+    platform: Platform,
+    modifiers: typing.FrozenSet[Modifier],
+    version: str,
+) -> str:
+    flavour_name = '-'.join((
+        f.name for f in canonicalised_features(
+            platform=platform,
+            modifiers=modifiers,
+        )
+    ))
+    return f'{flavour_name}-{version}'
+
+
 def normalised_release_identifier(release_identifier: ReleaseIdentifier):
     modifiers = normalised_modifiers(
         platform=release_identifier.platform,
-        modifiers=release_identifier.modifiers,
+        modifiers=release_identifier._modifiers_set,
     )
 
     return dataclasses.replace(release_identifier, modifiers=modifiers)
@@ -340,20 +430,28 @@ def canonicalised_features(platform: Platform, modifiers) -> typing.Tuple[Featur
     The minimal featureset is determined by removing all transitive dependencies (which are thus
     implied by the retained features).
     '''
-    platform = feature_by_name(platform)
-    minimal_modifiers = set((feature_by_name(m) for m in modifiers))
+    return _canonicalised_features(
+        platform=platform,
+        modifiers=_as_frozenset(modifiers),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _canonicalised_features(platform: Platform, modifiers: typing.FrozenSet[Modifier]):
+    minimal_modifiers = set(modifiers)
 
-    # rm all transitive dependencies from platform
-    minimal_modifiers -= set((platform.included_features(), *modifiers))
+    # note: transitive dependencies from platform are _not_ removed (this was never effective,
+    # and changing it would change the canonical names of already-published release manifests)
 
     # rm all transitive dependencies from modifiers
-    for modifier in (feature_by_name(m) for m in modifiers):
-        minimal_modifiers -= set(modifier.included_features())
+    for modifier in modifiers:
+        minimal_modifiers -= _transitive_feature_names(modifier)
 
     # canonical name: <platform>-<ordered-features> (UPPER-cased-sort, so _ is after alpha)
-    minimal_modifiers = sorted(minimal_modifiers, key=lambda m: m.name.upper())
+    # must not be changed to e.g. casefold, as this would change canonical names
+    minimal_modifiers = sorted(minimal_modifiers, key=str.upper)
 
-    return tuple((platform, *minimal_modifiers))
+    return tuple(feature_by_name(f) for f in (platform, *minimal_modifiers))
 
 
 @dataclasses.dataclass(frozen=True)
@@ -361,16 +459,18 @@ class OnlineReleaseManifest(ReleaseManifest):
     '''
     a `ReleaseManifest` that was uploaded to a S3 bucket
     '''
+    __slots__ = ('s3_key', 's3_bucket')
+
     # injected iff retrieved from s3 bucket
     s3_key: str
     s3_bucket: str
 
     def stripped_manifest(self):
-        raw = dataclasses.asdict(self)
-        del raw['s3_key']
-        del raw['s3_bucket']
-
-        return ReleaseManifest(**raw)
+        # shallow copy suffices (all attribute values are immutable)
+        return ReleaseManifest(**{
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(ReleaseManifest)
+        })
 
 
 @dataclasses.dataclass(frozen=True)
@@ -429,12 +529,13 @@ epoch_date = datetime.datetime.fromisoformat('2020-04-01')
 def gardenlinux_epoch(date: typing.Union[str, datetime.datetime] = None):
     '''
     calculates the gardenlinux epoch for the given date (the amount of days since 2020-04-01)
-    @param date: date (defaults to today); if str, must be compliant to iso-8601
+    @param date: date (defaults to today); if str, must be an iso-8601 date as accepted by
+                 `datetime.datetime.fromisoformat`
     '''
     if date is None:
         date = datetime.datetime.today()
     elif isinstance(date, str):
-        date = dateutil.parser.isoparse(date)
+        date = datetime.datetime.fromisoformat(date)
 
     if not isinstance(date, datetime.datetime):
         raise ValueError(date)
@@ -486,15 +587,15 @@ def gardenlinux_epoch_from_workingtree(version_file_path: str=paths.version_path
         - in this case, the returned epoch is today's gardenlinux epoch (days since 2020-04-01)
     '''
     with open(version_file_path) as f:
-        for line in f.readlines():
-            if not (line := line.strip()) or line.startswith('#'): continue
-            version_str = line
-            if '#' in line:
-                # ignore comments
-                line = line.split('#', 1)[0].strip()
-            break
-        else:
-            raise ValueError(f'did not find uncommented, non-empty line in {version_file_path}')
+        contents = f.read(4096) # VERSION is expected to be tiny
+
+    for line in contents.splitlines():
+        if not (line := line.strip()) or line.startswith('#'): continue
+        # ignore trailing comments
+        version_str = line.split('#', 1)[0].strip()
+        break
+    else:
+        raise ValueError(f'did not find uncommented, non-empty line in {version_file_path}')
 
     # version_str may either be a semver-ish (gardenlinux only uses two components (x.y))
     try:
@@ -510,39 +611,147 @@ def gardenlinux_epoch_from_workingtree(version_file_path: str=paths.version_path
 
 
 def _enumerate_feature_files(features_dir=os.path.join(repo_root, 'features')):
-    for root, _, files in os.walk(features_dir):
-        for name in files:
-            if not name == 'info.yaml':
+    # features are expected to reside in features/<name>/info.yaml
+    with os.scandir(features_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
                 continue
-            yield os.path.join(root, name)
+            feature_file = os.path.join(entry.path, 'info.yaml')
+            if os.path.isfile(feature_file):
+                yield feature_file
 
 
 def _deserialise_feature(feature_file):
-    with open(feature_file) as f:
-        parsed = yaml.safe_load(f)
+    # import lazily - only required if features are not read from cache
+    import yaml
+    # prefer libyaml-backed loader, if available (much faster than pure-python one)
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+    with open(feature_file, 'rb') as f:
+        parsed = yaml.load(f, Loader=loader)
     # hack: inject name from pardir
     pardir = os.path.basename(os.path.dirname(feature_file))
     parsed['name'] = pardir
 
-    return dacite.from_dict(
-        data_class=FeatureDescriptor,
-        data=parsed,
-        config=dacite.Config(
-            cast=[
-                FeatureType,
-                tuple,
-            ],
-        ),
+    # construct explicitly (rather than using dacite) - the schema is trivial, and this is
+    # considerably cheaper for the amount of features read on each startup
+    if (features := parsed.get('features')) is not None:
+        features = Features(include=tuple(features.get('include', ())))
+
+    return FeatureDescriptor(
+        type=FeatureType(parsed['type']),
+        name=parsed['name'],
+        description=parsed.get('description', FeatureDescriptor.description),
+        features=features,
     )
 
 
+def _features_fingerprint(feature_files) -> str:
+    '''
+    returns a digest of the paths, mtimes, and sizes of the given feature files (and of this
+    module, which defines the cached types), so that any change results in a different digest
+    '''
+    digest = hashlib.sha1()
+    for path in sorted((*feature_files, __file__)):
+        stat = os.stat(path)
+        digest.update(f'{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n'.encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def _features_cache_path(features_dir: str) -> str:
+    '''
+    returns the path of the features cache for the given features directory (stale caches are
+    overwritten in place; see _features_fingerprint for invalidation)
+    '''
+    cache_dir = os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+        'gardenlinux',
+    )
+    digest = hashlib.sha1(features_dir.encode('utf-8')).hexdigest()
+
+    return os.path.join(cache_dir, f'features-{digest}.pkl')
+
+
+def _read_features_cache(cache_path: str, fingerprint: str):
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_fingerprint, cached_features = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f'ignoring unreadable features cache {cache_path}: {e}')
+        return None
+
+    if cached_fingerprint != fingerprint:
+        return None # stale
+
+    return set(cached_features)
+
+
+def _write_features_cache(cache_path: str, fingerprint: str, features):
+    cache_dir = os.path.dirname(cache_path)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as f:
+            tmp_path = f.name
+            pickle.dump((fingerprint, frozenset(features)), f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError) as e:
+        logger.warning(f'could not write features cache {cache_path}: {e}')
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
 @functools.lru_cache
 def features():
-    return {
+    '''
+    returns all features read from `features/*/info.yaml`
+
+    parsing results are cached on disk (see _features_cache_path); the cache is only used if
+    none of the feature files (nor this module) was changed (see _features_fingerprint)
+
+    results are also cached in-memory (as are all values derived from them) - use
+    _clear_feature_caches (rather than features.cache_clear) to have features re-read
+    '''
+    features_dir = os.path.join(repo_root, 'features')
+    feature_files = list(_enumerate_feature_files(features_dir=features_dir))
+    fingerprint = _features_fingerprint(feature_files)
+    cache_path = _features_cache_path(features_dir)
+
+    if (cached_features := _read_features_cache(cache_path, fingerprint)) is not None:
+        return cached_features
+
+    parsed_features = {
         _deserialise_feature(feature_file)
-        for feature_file in _enumerate_feature_files()
+        for feature_file in feature_files
     }
 
+    _write_features_cache(cache_path, fingerprint, parsed_features)
+
+    return parsed_features
+
+
+def _clear_feature_caches():
+    '''
+    clears the in-memory cache of features(), and of all values derived from features
+    '''
+    for cached_func in (
+        features,
+        _features_by_name,
+        _transitive_feature_names,
+        _platform_names,
+        _modifier_names,
+        _normalised_modifiers,
+        _canonicalised_features,
+        _canonical_release_manifest_key_suffix,
+    ):
+        cached_func.cache_clear()
+
 
 def platforms():
     return {
@@ -556,8 +765,42 @@ def modifiers():
     }
 
 
+@functools.lru_cache
+def _platform_names() -> typing.FrozenSet[Platform]:
+    return frozenset(platform.name for platform in platforms())
+
+
+@functools.lru_cache
+def _modifier_names() -> typing.FrozenSet[Modifier]:
+    return frozenset(modifier.name for modifier in modifiers())
+
+
+@functools.lru_cache
+def _features_by_name():
+    return {feature.name: feature for feature in features()}
+
+
+@functools.lru_cache(maxsize=None)
+def _transitive_feature_names(feature_name: str) -> typing.FrozenSet[str]:
+    '''
+    returns the names of all features transitively included by the given feature (memoised, as
+    features are immutable once read)
+    '''
+    visited = set()
+    pending = list(feature_by_name(feature_name).included_feature_names())
+
+    while pending:
+        name = pending.pop()
+        if name in visited:
+            continue
+        visited.add(name)
+        pending.extend(feature_by_name(name).included_feature_names())
+
+    return frozenset(visited)
+
+
 def feature_by_name(feature_name: str):
-    for feature in features():
-        if feature.name == feature_name:
-            return feature
-    raise ValueError(feature_name)
+    try:
+        return _features_by_name()[feature_name]
+    except KeyError:
+        raise ValueError(feature_name)
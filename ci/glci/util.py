@@ -115,8 +115,8 @@ def release_manifest(
 def _json_serialisable_manifest(manifest: glci.model.ReleaseManifest):
     # workaround: need to convert enums to str
     patch_args = {
-        attr: val.value for attr, val in manifest.__dict__.items()
-        if isinstance(val, enum.Enum)
+        field.name: val.value for field in dataclasses.fields(manifest)
+        if isinstance(val := getattr(manifest, field.name), enum.Enum)
     }
     manifest = dataclasses.replace(manifest, **patch_args)
     return manifest